@@ -2,7 +2,6 @@
 from __future__ import annotations
 
 import logging
-import asyncio
 import voluptuous as vol
 from datetime import timedelta
 
@@ -12,7 +11,8 @@ from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers.storage import Store
 from homeassistant.helpers.dispatcher import async_dispatcher_send
 from homeassistant.helpers.event import async_track_time_interval
-from homeassistant.const import EVENT_HOMEASSISTANT_START, EVENT_STATE_CHANGED
+from homeassistant.helpers.start import async_at_start
+from homeassistant.const import EVENT_STATE_CHANGED
 from homeassistant.components.recorder import get_instance
 
 from .const import (
@@ -58,6 +58,12 @@ CONFIG_SCHEMA = vol.Schema(
     extra=vol.ALLOW_EXTRA,
 )
 
+SERVICE_INSIGHT_SCHEMA = vol.Schema(
+    {
+        vol.Required("insight_id"): cv.string,
+    }
+)
+
 
 async def async_setup(hass: HomeAssistant, config: dict) -> bool:
     """Set up the HA Insights integration."""
@@ -94,7 +100,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     observer = PatternObserver(hass)
     analyzer = PatternAnalyzer(hass)
     suggestion_generator = SuggestionGenerator(hass)
-    insight_manager = InsightManager(hass)
+    insight_manager = InsightManager(hass, store)
     
     # Store components and data
     hass.data[DOMAIN] = {
@@ -239,27 +245,24 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         DOMAIN,
         "dismiss_insight",
         async_dismiss_insight_service,
-        schema=vol.Schema({
-            vol.Required("insight_id"): cv.string,
-        })
+        schema=SERVICE_INSIGHT_SCHEMA,
     )
     
     hass.services.async_register(
         DOMAIN,
         "mark_implemented",
         async_mark_implemented_service,
-        schema=vol.Schema({
-            vol.Required("insight_id"): cv.string,
-        })
+        schema=SERVICE_INSIGHT_SCHEMA,
     )
     
-    # Start analysis after Home Assistant is fully started
+    # Start analysis once Home Assistant is started, or right away if the
+    # entry is set up after startup (the start event would never fire)
     @callback
-    def async_startup(_):
+    def async_startup(_hass: HomeAssistant) -> None:
         """Run first analysis when Home Assistant starts."""
         hass.async_create_task(async_analyze_patterns())
     
-    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_START, async_startup)
+    async_at_start(hass, async_startup)
     
     return True
 
@@ -1,11 +1,11 @@
 """Insight Manager for storing, retrieving, and managing insights."""
 from __future__ import annotations
 
+import heapq
 import logging
-import json
 import uuid
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional, Set
+from typing import Any, Dict, List, Optional
 
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.storage import Store
@@ -22,14 +22,17 @@ from ..const import (
     INSIGHT_TYPE_COMFORT,
     INSIGHT_TYPE_CONVENIENCE,
     INSIGHT_TYPE_SECURITY,
-    STORAGE_VERSION,
-    STORAGE_KEY,
     DEFAULT_INSIGHTS_SCAN_INTERVAL,
 )
 
 _LOGGER = logging.getLogger(__name__)
 
 
+def _insight_timestamp(insight: Dict[str, Any]) -> str:
+    """Return the sort key for ordering insights by timestamp."""
+    return insight.get("timestamp", "")
+
+
 class InsightManager:
     """
     Manages insights storage, retrieval, and lifecycle.
@@ -41,17 +44,18 @@ class InsightManager:
     4. Maintains insight history
     """
     
-    def __init__(self, hass: HomeAssistant):
+    def __init__(self, hass: HomeAssistant, store: Store):
         """Initialize the insight manager."""
         self.hass = hass
         self._domain = DOMAIN
-        self._store = Store(hass, STORAGE_VERSION, STORAGE_KEY)
+        self._store = store
         self._insights: List[Dict[str, Any]] = []
         self._implemented_insights: List[Dict[str, Any]] = []
         self._dismissed_insights: List[Dict[str, Any]] = []
         self._insight_history: Dict[str, List[Dict[str, Any]]] = {}
         self._last_scan: Optional[datetime] = None
         self._insights_by_entity: Dict[str, List[str]] = {}
+        self._insights_by_id: Dict[str, Dict[str, Any]] = {}
     
     async def async_load(self) -> None:
         """Load insights from storage."""
@@ -89,22 +93,19 @@ class InsightManager:
         )
     
     def _rebuild_entity_index(self) -> None:
-        """Rebuild the entity to insight mapping."""
+        """Rebuild the entity and ID mappings for active insights."""
         self._insights_by_entity = {}
+        self._insights_by_id = {insight["id"]: insight for insight in self._insights}
         
         for insight in self._insights:
-            entity_id = insight.get("entity_id")
-            related_entity_id = insight.get("related_entity_id")
-            
+            self._index_insight_entities(insight)
+    
+    def _index_insight_entities(self, insight: Dict[str, Any]) -> None:
+        """Add an insight to the entity to insight mapping."""
+        for key in ("entity_id", "related_entity_id"):
+            entity_id = insight.get(key)
             if entity_id:
-                if entity_id not in self._insights_by_entity:
-                    self._insights_by_entity[entity_id] = []
-                self._insights_by_entity[entity_id].append(insight["id"])
-            
-            if related_entity_id:
-                if related_entity_id not in self._insights_by_entity:
-                    self._insights_by_entity[related_entity_id] = []
-                self._insights_by_entity[related_entity_id].append(insight["id"])
+                self._insights_by_entity.setdefault(entity_id, []).append(insight["id"])
     
     async def async_save(self) -> None:
         """Save insights to storage."""
@@ -126,6 +127,18 @@ class InsightManager:
         Returns:
             The ID of the added insight
         """
+        insight_id = self._add_insight(insight)
+        
+        # Save changes
+        await self.async_save()
+        
+        # Notify listeners
+        async_dispatcher_send(self.hass, SIGNAL_INSIGHTS_UPDATED)
+        
+        return insight_id
+    
+    def _add_insight(self, insight: Dict[str, Any]) -> str:
+        """Add or update an insight in memory without saving or notifying."""
         # Ensure the insight has an ID
         if "id" not in insight:
             insight["id"] = f"insight_{uuid.uuid4().hex[:8]}"
@@ -135,8 +148,7 @@ class InsightManager:
             insight["timestamp"] = utcnow().isoformat()
         
         # Check if this is a duplicate
-        existing_ids = {i["id"] for i in self._insights}
-        if insight["id"] in existing_ids:
+        if insight["id"] in self._insights_by_id:
             # Update existing insight
             for i, existing in enumerate(self._insights):
                 if existing["id"] == insight["id"]:
@@ -147,30 +159,15 @@ class InsightManager:
                     
                     # Update with new data
                     self._insights[i] = insight
+                    self._insights_by_id[insight["id"]] = insight
                     break
         else:
             # Add new insight
             self._insights.append(insight)
+            self._insights_by_id[insight["id"]] = insight
             
             # Update entity index
-            entity_id = insight.get("entity_id")
-            related_entity_id = insight.get("related_entity_id")
-            
-            if entity_id:
-                if entity_id not in self._insights_by_entity:
-                    self._insights_by_entity[entity_id] = []
-                self._insights_by_entity[entity_id].append(insight["id"])
-            
-            if related_entity_id:
-                if related_entity_id not in self._insights_by_entity:
-                    self._insights_by_entity[related_entity_id] = []
-                self._insights_by_entity[related_entity_id].append(insight["id"])
-        
-        # Save changes
-        await self.async_save()
-        
-        # Notify listeners
-        async_dispatcher_send(self.hass, SIGNAL_INSIGHTS_UPDATED)
+            self._index_insight_entities(insight)
         
         return insight["id"]
     
@@ -187,14 +184,14 @@ class InsightManager:
         if not insights:
             return []
             
-        added_ids = []
-        for insight in insights:
-            insight_id = await self.async_add_insight(insight)
-            added_ids.append(insight_id)
+        # Save and notify once for the whole batch
+        added_ids = [self._add_insight(insight) for insight in insights]
         
         self._last_scan = utcnow()
         await self.async_save()
         
+        async_dispatcher_send(self.hass, SIGNAL_INSIGHTS_UPDATED)
+        
         return added_ids
     
     async def async_dismiss_insight(self, insight_id: str) -> bool:
@@ -207,13 +204,16 @@ class InsightManager:
         Returns:
             True if dismissed, False otherwise
         """
+        if insight_id not in self._insights_by_id:
+            return False
+        
         for i, insight in enumerate(self._insights):
             if insight["id"] == insight_id:
                 # Mark as dismissed
                 insight["dismissed"] = True
                 
                 # Move to dismissed list
-                self._dismissed_insights.append(insight.copy())
+                self._dismissed_insights.append(insight)
                 self._insights.pop(i)
                 
                 # Update entity index
@@ -239,6 +239,9 @@ class InsightManager:
         Returns:
             True if marked, False otherwise
         """
+        if insight_id not in self._insights_by_id:
+            return False
+        
         for i, insight in enumerate(self._insights):
             if insight["id"] == insight_id:
                 # Mark as implemented
@@ -246,7 +249,7 @@ class InsightManager:
                 insight["implemented_timestamp"] = utcnow().isoformat()
                 
                 # Move to implemented list
-                self._implemented_insights.append(insight.copy())
+                self._implemented_insights.append(insight)
                 self._insights.pop(i)
                 
                 # Update entity index
@@ -320,8 +323,12 @@ class InsightManager:
                 for source in sources:
                     results.extend(source)
         
-        # Sort by timestamp (newest first)
-        results.sort(key=lambda x: x.get("timestamp", ""), reverse=True)
+        # Sort by timestamp (newest first); when a limit is given only the
+        # requested page and the ones before it need to be ordered
+        if limit is not None and limit >= 0 and offset >= 0:
+            results = heapq.nlargest(offset + limit, results, key=_insight_timestamp)
+        else:
+            results.sort(key=_insight_timestamp, reverse=True)
         
         # Apply pagination
         if offset > 0:
@@ -343,9 +350,9 @@ class InsightManager:
             The insight or None if not found
         """
         # Check active insights
-        for insight in self._insights:
-            if insight["id"] == insight_id:
-                return insight
+        insight = self._insights_by_id.get(insight_id)
+        if insight is not None:
+            return insight
         
         # Check dismissed insights
         for insight in self._dismissed_insights:
@@ -383,16 +390,13 @@ class InsightManager:
         """
         if entity_id not in self._insights_by_entity:
             return []
-            
-        insight_ids = set(self._insights_by_entity[entity_id])
-        results = []
         
-        # Check active insights
-        for insight in self._insights:
-            if insight["id"] in insight_ids:
-                results.append(insight)
-        
-        return results
+        # Resolve active insights through the ID index
+        return [
+            self._insights_by_id[insight_id]
+            for insight_id in dict.fromkeys(self._insights_by_entity[entity_id])
+            if insight_id in self._insights_by_id
+        ]
     
     def get_insight_stats(self) -> Dict[str, Any]:
         """
@@ -403,16 +407,21 @@ class InsightManager:
         """
         total = len(self._insights) + len(self._dismissed_insights) + len(self._implemented_insights)
         
-        # Count by type
-        type_counts = {}
-        for insight_type in [
-            INSIGHT_TYPE_AUTOMATION,
-            INSIGHT_TYPE_ENERGY,
-            INSIGHT_TYPE_COMFORT,
-            INSIGHT_TYPE_CONVENIENCE,
-            INSIGHT_TYPE_SECURITY,
-        ]:
-            type_counts[insight_type] = len(self.get_insights(insight_type=insight_type, dismissed=True, implemented=True))
+        # Count by type in a single pass over all insights
+        type_counts = dict.fromkeys(
+            (
+                INSIGHT_TYPE_AUTOMATION,
+                INSIGHT_TYPE_ENERGY,
+                INSIGHT_TYPE_COMFORT,
+                INSIGHT_TYPE_CONVENIENCE,
+                INSIGHT_TYPE_SECURITY,
+            ),
+            0,
+        )
+        for source in (self._insights, self._dismissed_insights, self._implemented_insights):
+            for insight in source:
+                if insight["type"] in type_counts:
+                    type_counts[insight["type"]] += 1
         
         # Calculate implementation rate
         implementation_rate = 0
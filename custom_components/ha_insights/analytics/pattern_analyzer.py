@@ -1,14 +1,16 @@
 """Pattern Analyzer for identifying usage patterns in Home Assistant data."""
 from __future__ import annotations
 
+import asyncio
 import logging
+import re
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional, Set, Tuple
+from functools import partial
+from typing import Any, Dict, List, Optional
 
-import numpy as np
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.template import utcnow
-from homeassistant.components.recorder import history
+from homeassistant.components.recorder import get_instance, history
 
 from ..const import (
     INSIGHT_TYPE_AUTOMATION,
@@ -19,10 +21,23 @@ from ..const import (
     INSIGHT_TYPE_ANOMALY,
     CONF_INSIGHT_SENSITIVITY,
     DEFAULT_INSIGHT_SENSITIVITY,
+    HOUR_LABELS,
 )
 
 _LOGGER = logging.getLogger(__name__)
 
+# Domains that only report state and cannot be controlled directly
+UNCONTROLLABLE_DOMAINS = frozenset({"sensor", "binary_sensor", "weather", "sun", "person"})
+
+# Controllable domains considered for entity correlations
+CORRELATION_TARGET_DOMAINS = frozenset({"light", "switch", "climate", "cover", "media_player"})
+
+# Sensor-like domains that can act as automation triggers
+CORRELATION_SOURCE_DOMAINS = frozenset({"binary_sensor", "sensor", "person", "device_tracker"})
+
+# Entity id keywords identifying energy-related sensors
+ENERGY_ENTITY_PATTERN = re.compile("power|energy|electricity|consumption|usage")
+
 
 class PatternAnalyzer:
     """
@@ -42,14 +57,25 @@ class PatternAnalyzer:
         self._sensitivity = DEFAULT_INSIGHT_SENSITIVITY
         self._identified_patterns: List[Dict[str, Any]] = []
         self._last_analysis: Optional[datetime] = None
+        self._analysis_task: Optional[asyncio.Task] = None
     
     async def analyze(self) -> List[Dict[str, Any]]:
         """
         Run a full analysis to identify patterns and insights.
         
+        Callers that arrive while an analysis is already running (e.g. the
+        startup run and a scheduled run) share its result instead of
+        starting a second one.
+        
         Returns:
             List of pattern dictionaries
         """
+        if self._analysis_task is None or self._analysis_task.done():
+            self._analysis_task = self.hass.async_create_task(self._async_run_analysis())
+        return await asyncio.shield(self._analysis_task)
+    
+    async def _async_run_analysis(self) -> List[Dict[str, Any]]:
+        """Run the analysis passes and merge newly found patterns."""
         _LOGGER.debug("Starting pattern analysis")
         
         # Get observer data
@@ -62,17 +88,19 @@ class PatternAnalyzer:
         entry = self.hass.config_entries.async_entries(self._domain)[0]
         self._sensitivity = entry.options.get(CONF_INSIGHT_SENSITIVITY, DEFAULT_INSIGHT_SENSITIVITY)
         
-        # Analyze time-based patterns
-        time_patterns = await self._analyze_time_patterns(observer)
-        
-        # Analyze entity correlations
-        correlation_patterns = await self._analyze_entity_correlations(observer)
-        
-        # Analyze energy usage patterns
-        energy_patterns = await self._analyze_energy_usage()
-        
-        # Analyze comfort patterns
-        comfort_patterns = await self._analyze_comfort_conditions()
+        # Run the independent analyses concurrently so the recorder query for
+        # energy usage does not hold up the others
+        (
+            time_patterns,
+            correlation_patterns,
+            energy_patterns,
+            comfort_patterns,
+        ) = await asyncio.gather(
+            self._analyze_time_patterns(observer),
+            self._analyze_entity_correlations(observer),
+            self._analyze_energy_usage(),
+            self._analyze_comfort_conditions(),
+        )
         
         # Combine all patterns
         new_patterns = time_patterns + correlation_patterns + energy_patterns + comfort_patterns
@@ -87,7 +115,7 @@ class PatternAnalyzer:
         # Update last analysis timestamp
         self._last_analysis = utcnow()
         
-        _LOGGER.info("Pattern analysis complete. Found %d patterns: %d time-based, %d correlations, %d energy, %d comfort",
+        _LOGGER.debug("Pattern analysis complete. Found %d patterns: %d time-based, %d correlations, %d energy, %d comfort",
                    len(new_patterns), len(time_patterns), len(correlation_patterns), 
                    len(energy_patterns), len(comfort_patterns))
         
@@ -104,6 +132,7 @@ class PatternAnalyzer:
             List of time-based pattern dictionaries
         """
         patterns = []
+        timestamp = utcnow().isoformat()
         
         # Get daily patterns
         daily_patterns = observer.get_daily_patterns()
@@ -113,7 +142,7 @@ class PatternAnalyzer:
             domain = entity_id.split(".", 1)[0]
             
             # Skip entities that can't be controlled
-            if domain in ["sensor", "binary_sensor", "weather", "sun", "person"]:
+            if domain in UNCONTROLLABLE_DOMAINS:
                 continue
                 
             # Look for clear on/off time patterns
@@ -126,7 +155,7 @@ class PatternAnalyzer:
             # Check if we have a clear pattern
             if len(on_hours) >= 2:
                 # Convert hours to readable format
-                readable_hours = [f"{h:02d}:00" for h in on_hours]
+                readable_hours = [HOUR_LABELS[h] for h in on_hours]
                 
                 # Generate pattern ID
                 pattern_id = f"time_pattern_{entity_id}_{'_'.join(str(h) for h in on_hours)}"
@@ -143,7 +172,7 @@ class PatternAnalyzer:
                         "active_hours": on_hours,
                         "days_observed": sum(states["on"] for hour, states in hours.items()),
                     },
-                    "timestamp": utcnow().isoformat()
+                    "timestamp": timestamp
                 })
         
         return patterns
@@ -159,6 +188,7 @@ class PatternAnalyzer:
             List of correlation pattern dictionaries
         """
         patterns = []
+        timestamp = utcnow().isoformat()
         
         # Get entity correlations
         correlations = observer.get_entity_correlations()
@@ -168,7 +198,7 @@ class PatternAnalyzer:
             entity_domain = entity_id.split(".", 1)[0]
             
             # Focus on correlations with sensors (most valuable for automation)
-            if entity_domain not in ["light", "switch", "climate", "cover", "media_player"]:
+            if entity_domain not in CORRELATION_TARGET_DOMAINS:
                 continue
             
             # Find related sensors
@@ -176,7 +206,7 @@ class PatternAnalyzer:
                 related_domain = related_id.split(".", 1)[0]
                 
                 # Only consider strong correlations with sensors
-                if score < 0.5 or related_domain not in ["binary_sensor", "sensor", "person", "device_tracker"]:
+                if score < 0.5 or related_domain not in CORRELATION_SOURCE_DOMAINS:
                     continue
                 
                 # Generate pattern ID
@@ -205,7 +235,7 @@ class PatternAnalyzer:
                     "data": {
                         "correlation_score": score,
                     },
-                    "timestamp": utcnow().isoformat()
+                    "timestamp": timestamp
                 })
         
         return patterns
@@ -218,24 +248,32 @@ class PatternAnalyzer:
             List of energy pattern dictionaries
         """
         patterns = []
+        timestamp = utcnow().isoformat()
         
-        # Get entity states
-        energy_entities = []
-        for entity_id in self.hass.states.async_entity_ids():
-            # Look for energy-related sensors
-            if entity_id.startswith("sensor.") and any(
-                keyword in entity_id for keyword in ["power", "energy", "electricity", "consumption", "usage"]
-            ):
-                energy_entities.append(entity_id)
+        # Look for energy-related sensors
+        energy_entities = [
+            entity_id
+            for entity_id in self.hass.states.async_entity_ids("sensor")
+            if ENERGY_ENTITY_PATTERN.search(entity_id)
+        ]
         
         if not energy_entities:
             return patterns
         
-        # Get history for energy entities
+        # Get history for energy entities (blocking database query, so run
+        # it in the recorder's executor instead of the event loop). Only the
+        # state values are used, so skip loading attributes.
         end_time = utcnow()
         start_time = end_time - timedelta(days=7)
-        energy_history = await history.get_significant_states(
-            self.hass, start_time, end_time, energy_entities
+        energy_history = await get_instance(self.hass).async_add_executor_job(
+            partial(
+                history.get_significant_states,
+                self.hass,
+                start_time,
+                end_time,
+                energy_entities,
+                no_attributes=True,
+            )
         )
         
         # Analyze each energy entity
@@ -284,10 +322,10 @@ class PatternAnalyzer:
                             "peak_usage": max_value,
                             "peak_time": max_time.isoformat(),
                         },
-                        "timestamp": utcnow().isoformat()
+                        "timestamp": timestamp
                     })
             except Exception as e:
-                _LOGGER.error("Error analyzing energy entity %s: %s", entity_id, str(e))
+                _LOGGER.error("Error analyzing energy entity %s: %s", entity_id, e)
         
         return patterns
     
@@ -299,28 +337,19 @@ class PatternAnalyzer:
             List of comfort pattern dictionaries
         """
         patterns = []
+        timestamp = utcnow().isoformat()
         
-        # Find climate devices and temperature sensors
-        climate_entities = []
-        temp_sensors = []
-        
-        for entity_id in self.hass.states.async_entity_ids():
-            if entity_id.startswith("climate."):
-                climate_entities.append(entity_id)
-            elif entity_id.startswith("sensor.") and any(
-                keyword in entity_id for keyword in ["temp", "temperature"]
-            ):
-                temp_sensors.append(entity_id)
-        
-        if not climate_entities and not temp_sensors:
-            return patterns
+        # Find temperature sensors, taking their states in the same pass
+        temp_states = [
+            state
+            for state in self.hass.states.async_all("sensor")
+            if "temp" in state.entity_id  # also matches "temperature"
+        ]
         
         # Analyze temperature conditions
-        for entity_id in temp_sensors:
-            state = self.hass.states.get(entity_id)
-            if not state:
-                continue
-                
+        for state in temp_states:
+            entity_id = state.entity_id
+            
             try:
                 temp = float(state.state)
                 
@@ -338,7 +367,7 @@ class PatternAnalyzer:
                             "current_temp": temp,
                             "recommended_min": 18,
                         },
-                        "timestamp": utcnow().isoformat()
+                        "timestamp": timestamp
                     })
                 elif temp > 25:  # Too warm
                     pattern_id = f"comfort_too_warm_{entity_id}"
@@ -353,7 +382,7 @@ class PatternAnalyzer:
                             "current_temp": temp,
                             "recommended_max": 25,
                         },
-                        "timestamp": utcnow().isoformat()
+                        "timestamp": timestamp
                     })
             except (ValueError, TypeError):
                 continue
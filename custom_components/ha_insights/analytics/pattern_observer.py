@@ -2,8 +2,9 @@
 from __future__ import annotations
 
 import logging
+from collections import deque
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional, Set
+from typing import Any, Deque, Dict, FrozenSet, List, Optional, Set
 
 from homeassistant.core import HomeAssistant, State
 from homeassistant.helpers.event import async_track_point_in_time
@@ -18,6 +19,12 @@ DEFAULT_AGGREGATION_WINDOW = timedelta(minutes=10)
 # Number of state changes to keep in history
 MAX_STATE_CHANGES = 1000
 
+# Lookup table mapping raw state values to their on/off classification
+STATE_CLASSIFICATION = {
+    **dict.fromkeys(("on", "home", "open", "unlocked", "active", "playing"), "on"),
+    **dict.fromkeys(("off", "away", "closed", "locked", "inactive", "idle", "paused", "standby"), "off"),
+}
+
 
 class PatternObserver:
     """
@@ -33,17 +40,18 @@ class PatternObserver:
     def __init__(self, hass: HomeAssistant):
         """Initialize the pattern observer."""
         self.hass = hass
-        self._domains_to_track: List[str] = []
+        self._domains_to_track: FrozenSet[str] = frozenset()
         self._exclude_entities: Set[str] = set()
         
         # Storage for observations
-        self._state_changes: Dict[str, List[Dict[str, Any]]] = {}
+        self._state_changes: Dict[str, Deque[Dict[str, Any]]] = {}
         self._daily_patterns: Dict[str, Dict[int, Dict[str, int]]] = {}
         self._weekly_patterns: Dict[str, Dict[int, Dict[str, int]]] = {}
         self._entity_correlations: Dict[str, Dict[str, float]] = {}
         
         # Aggregated state tracking (to avoid processing too many changes)
         self._pending_changes: Dict[str, List[Dict[str, Any]]] = {}
+        self._pending_count = 0
         self._last_aggregation: datetime = utcnow()
         
         # Schedule regular aggregation
@@ -55,7 +63,7 @@ class PatternObserver:
     
     def set_tracked_domains(self, domains: List[str]) -> None:
         """Set the domains to track for pattern analysis."""
-        self._domains_to_track = domains
+        self._domains_to_track = frozenset(domains)
     
     def exclude_entities(self, entity_ids: List[str]) -> None:
         """Exclude specific entities from tracking."""
@@ -63,19 +71,10 @@ class PatternObserver:
     
     def get_tracked_entities(self) -> Set[str]:
         """Get the list of entities being tracked."""
-        entities = set()
-        
-        # If specific domains are set, track all entities in those domains
-        if self._domains_to_track:
-            for entity_id in self.hass.states.async_entity_ids():
-                domain = entity_id.split(".", 1)[0]
-                if domain in self._domains_to_track and entity_id not in self._exclude_entities:
-                    entities.add(entity_id)
-        else:
-            # If no domains specified, track all entities except excluded ones
-            entities = set(self.hass.states.async_entity_ids()) - self._exclude_entities
-        
-        return entities
+        # If specific domains are set, let the state machine filter by domain;
+        # otherwise track all entities except excluded ones
+        entity_ids = self.hass.states.async_entity_ids(self._domains_to_track or None)
+        return set(entity_ids) - self._exclude_entities
     
     def process_state_change(self, entity_id: str, old_state: State, new_state: State) -> None:
         """Process a state change event and record relevant information."""
@@ -114,12 +113,13 @@ class PatternObserver:
         # Record the state change
         now = utcnow()
         
+        # State attributes are read-only, so they can be referenced without copying
         change = {
             "entity_id": entity_id,
             "old_state": old_state.state,
             "new_state": new_state.state,
-            "old_attributes": dict(old_state.attributes),
-            "new_attributes": dict(new_state.attributes),
+            "old_attributes": old_state.attributes,
+            "new_attributes": new_state.attributes,
             "timestamp": now.isoformat(),
             "time_of_day": now.hour,
             "day_of_week": now.weekday(),
@@ -131,9 +131,10 @@ class PatternObserver:
             self._pending_changes[entity_id] = []
         
         self._pending_changes[entity_id].append(change)
+        self._pending_count += 1
         
         # If we have too many pending changes, process them now
-        if sum(len(changes) for changes in self._pending_changes.values()) > 100:
+        if self._pending_count > 100:
             self._process_pending_changes()
     
     async def _aggregate_state_changes(self, _now: datetime) -> None:
@@ -158,7 +159,7 @@ class PatternObserver:
                 
             # Initialize storage for this entity if needed
             if entity_id not in self._state_changes:
-                self._state_changes[entity_id] = []
+                self._state_changes[entity_id] = deque(maxlen=MAX_STATE_CHANGES)
                 
             if entity_id not in self._daily_patterns:
                 self._daily_patterns[entity_id] = {hour: {"on": 0, "off": 0, "other": 0} for hour in range(24)}
@@ -168,10 +169,8 @@ class PatternObserver:
             
             # Process each change
             for change in changes:
-                # Add to state history, keeping only the most recent changes
+                # Add to state history; the bounded deque drops the oldest changes
                 self._state_changes[entity_id].append(change)
-                if len(self._state_changes[entity_id]) > MAX_STATE_CHANGES:
-                    self._state_changes[entity_id].pop(0)
                 
                 # Update daily patterns
                 hour = change["time_of_day"]
@@ -187,22 +186,18 @@ class PatternObserver:
         if len(changed_entities) > 1:
             self._update_entity_correlations(changed_entities)
         
+        _LOGGER.debug("Processed %d state changes for %d entities", 
+                     self._pending_count,
+                     len(self._pending_changes))
+        
         # Clear pending changes
         self._pending_changes = {}
+        self._pending_count = 0
         self._last_aggregation = utcnow()
-        
-        _LOGGER.debug("Processed %d state changes for %d entities", 
-                     sum(len(changes) for changes in self._pending_changes.values()),
-                     len(self._pending_changes))
     
     def _classify_state(self, state: str) -> str:
         """Classify a state value as on, off, or other."""
-        if state.lower() in ("on", "home", "open", "unlocked", "active", "playing"):
-            return "on"
-        elif state.lower() in ("off", "away", "closed", "locked", "inactive", "idle", "paused", "standby"):
-            return "off"
-        else:
-            return "other"
+        return STATE_CLASSIFICATION.get(state.lower(), "other")
     
     def _update_entity_correlations(self, entities: List[str]) -> None:
         """Update the correlation scores between entities that changed together."""
@@ -236,10 +231,10 @@ class PatternObserver:
                         0.9, self._entity_correlations[entity2][entity1] + 0.05
                     )
     
-    def get_state_changes(self, entity_id: Optional[str] = None) -> Dict[str, List[Dict[str, Any]]]:
+    def get_state_changes(self, entity_id: Optional[str] = None) -> Dict[str, Deque[Dict[str, Any]]]:
         """Get the recorded state changes."""
         if entity_id:
-            return {entity_id: self._state_changes.get(entity_id, [])}
+            return {entity_id: self._state_changes.get(entity_id, deque())}
         return self._state_changes
     
     def get_daily_patterns(self, entity_id: Optional[str] = None) -> Dict[str, Dict[int, Dict[str, int]]]:
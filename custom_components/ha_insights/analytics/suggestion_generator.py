@@ -1,9 +1,10 @@
 """Suggestion Generator for creating automation suggestions from patterns."""
 from __future__ import annotations
 
+import heapq
 import logging
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional, Set, Tuple
+from typing import Any, Dict, List, Optional
 
 from homeassistant.core import HomeAssistant, Event
 from homeassistant.helpers.template import utcnow
@@ -19,10 +20,20 @@ from ..const import (
     INSIGHT_TYPE_COMFORT,
     INSIGHT_TYPE_CONVENIENCE,
     INSIGHT_TYPE_SECURITY,
+    HOUR_LABELS,
 )
 
 _LOGGER = logging.getLogger(__name__)
 
+# Service and service data used by time-based automations, keyed by domain
+TIME_AUTOMATION_ACTIONS = {
+    "light": ("turn_on", (("brightness_pct", 80),)),
+    "switch": ("turn_on", ()),
+    "climate": ("set_temperature", (("temperature", 21),)),
+    "cover": ("open_cover", ()),
+}
+DEFAULT_TIME_AUTOMATION_ACTION = ("turn_on", ())
+
 
 class SuggestionGenerator:
     """
@@ -64,7 +75,7 @@ class SuggestionGenerator:
         # Get patterns
         patterns = analyzer.get_patterns()
         if not patterns:
-            _LOGGER.info("No patterns available for generating suggestions")
+            _LOGGER.debug("No patterns available for generating suggestions")
             return []
         
         # Generate suggestions for different pattern types
@@ -75,12 +86,14 @@ class SuggestionGenerator:
         # Combine all suggestions
         all_suggestions = automation_suggestions + energy_suggestions + comfort_suggestions
         
-        # Sort by confidence and limit to max suggestions
-        all_suggestions.sort(key=lambda x: x["confidence"], reverse=True)
-        suggestions = all_suggestions[:self._max_suggestions]
+        # Keep the most confident suggestions, up to max suggestions
+        suggestions = heapq.nlargest(
+            self._max_suggestions, all_suggestions, key=lambda x: x["confidence"]
+        )
         
-        # Create insights from suggestions
+        # Create insights from suggestions, all stamped with this run's time
         new_insights = []
+        timestamp = utcnow().isoformat()
         existing_insight_ids = {i["id"] for i in self._generated_insights}
         
         for suggestion in suggestions:
@@ -101,7 +114,7 @@ class SuggestionGenerator:
                 "entity_id": suggestion.get("entity_id"),
                 "related_entity_id": suggestion.get("related_entity_id"),
                 "suggestions": [suggestion],
-                "timestamp": utcnow().isoformat(),
+                "timestamp": timestamp,
                 "dismissed": False,
             }
             
@@ -120,7 +133,7 @@ class SuggestionGenerator:
                 self.hass.data[self._domain]["stored_data"]
             )
         
-        _LOGGER.info("Generated %d new insights from patterns", len(new_insights))
+        _LOGGER.debug("Generated %d new insights from patterns", len(new_insights))
         return new_insights
     
     async def _generate_automation_suggestions(self, patterns: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
@@ -158,7 +171,7 @@ class SuggestionGenerator:
                     for hour in active_hours:
                         triggers.append({
                             "platform": "time",
-                            "at": f"{hour:02d}:00:00"
+                            "at": f"{HOUR_LABELS[hour]}:00"
                         })
                     
                     # Generate YAML
@@ -169,7 +182,7 @@ class SuggestionGenerator:
                         "type": INSIGHT_TYPE_AUTOMATION,
                         "entity_id": entity_id,
                         "title": f"Scheduled automation for {entity_id}",
-                        "description": f"Automatically control {entity_id} at regular times ({', '.join(f'{h:02d}:00' for h in active_hours)})",
+                        "description": f"Automatically control {entity_id} at regular times ({', '.join(HOUR_LABELS[h] for h in active_hours)})",
                         "confidence": pattern["confidence"],
                         "yaml": yaml_content,
                         "automation_type": "time_based",
@@ -275,6 +288,11 @@ class SuggestionGenerator:
         
         # Filter to comfort patterns
         comfort_patterns = [p for p in patterns if p["type"] == INSIGHT_TYPE_COMFORT]
+        if not comfort_patterns:
+            return suggestions
+        
+        # Find climate entities that could help (shared by all comfort patterns)
+        climate_entities = self.hass.states.async_entity_ids("climate")
         
         for pattern in comfort_patterns:
             entity_id = pattern.get("entity_id")
@@ -290,11 +308,6 @@ class SuggestionGenerator:
                 if current_temp is None:
                     continue
                     
-                # Find climate entities that could help
-                climate_entities = []
-                for entity_id in self.hass.states.async_entity_ids("climate"):
-                    climate_entities.append(entity_id)
-                
                 if climate_entities:
                     # Generate YAML for climate adjustment
                     yaml_content = self._generate_climate_adjustment_yaml(
@@ -321,11 +334,6 @@ class SuggestionGenerator:
                 if current_temp is None:
                     continue
                     
-                # Find climate entities that could help
-                climate_entities = []
-                for entity_id in self.hass.states.async_entity_ids("climate"):
-                    climate_entities.append(entity_id)
-                
                 if climate_entities:
                     # Generate YAML for climate adjustment
                     yaml_content = self._generate_climate_adjustment_yaml(
@@ -361,34 +369,17 @@ class SuggestionGenerator:
             yaml_lines.append("    - platform: {}".format(trigger["platform"]))
             yaml_lines.append("      at: \"{}\"".format(trigger["at"]))
         
-        # Add action based on domain
+        # Add action based on domain (generic turn_on for unknown domains)
         yaml_lines.append("  action:")
         
-        if domain == "light":
-            yaml_lines.append("    - service: light.turn_on")
-            yaml_lines.append("      target:")
-            yaml_lines.append("        entity_id: {}".format(entity_id))
+        service, service_data = TIME_AUTOMATION_ACTIONS.get(domain, DEFAULT_TIME_AUTOMATION_ACTION)
+        yaml_lines.append("    - service: {}.{}".format(domain, service))
+        yaml_lines.append("      target:")
+        yaml_lines.append("        entity_id: {}".format(entity_id))
+        if service_data:
             yaml_lines.append("      data:")
-            yaml_lines.append("        brightness_pct: 80")
-        elif domain == "switch":
-            yaml_lines.append("    - service: switch.turn_on")
-            yaml_lines.append("      target:")
-            yaml_lines.append("        entity_id: {}".format(entity_id))
-        elif domain == "climate":
-            yaml_lines.append("    - service: climate.set_temperature")
-            yaml_lines.append("      target:")
-            yaml_lines.append("        entity_id: {}".format(entity_id))
-            yaml_lines.append("      data:")
-            yaml_lines.append("        temperature: 21")
-        elif domain == "cover":
-            yaml_lines.append("    - service: cover.open_cover")
-            yaml_lines.append("      target:")
-            yaml_lines.append("        entity_id: {}".format(entity_id))
-        else:
-            # Generic turn_on action
-            yaml_lines.append("    - service: {}.turn_on".format(domain))
-            yaml_lines.append("      target:")
-            yaml_lines.append("        entity_id: {}".format(entity_id))
+            for key, value in service_data:
+                yaml_lines.append("        {}: {}".format(key, value))
         
         return "\n".join(yaml_lines)
     
@@ -3,7 +3,7 @@ from __future__ import annotations
 
 import logging
 import voluptuous as vol
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Optional
 
 from homeassistant import config_entries
 from homeassistant.core import HomeAssistant, callback
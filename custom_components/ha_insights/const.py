@@ -102,4 +102,7 @@ ICON_SECURITY = "mdi:shield-home"
 ICON_SUMMARY = "mdi:lightbulb-group"
 
 # Limits
-MAX_STATE_CHANGES = 1000  # Maximum state changes to keep in history 
\ No newline at end of file
+MAX_STATE_CHANGES = 1000  # Maximum state changes to keep in history
+
+# Display labels for each hour of the day, e.g. "07:00"
+HOUR_LABELS = tuple(f"{hour:02d}:00" for hour in range(24))
@@ -1,9 +1,8 @@
 """Sensor platform for HA Insights."""
 from __future__ import annotations
 
-from datetime import datetime
 import logging
-from typing import Any, Optional, cast
+from typing import Any
 
 from homeassistant.components.sensor import (
     SensorEntity,
@@ -32,6 +31,15 @@ from .const import (
 
 _LOGGER = logging.getLogger(__name__)
 
+# Icons for insight sensors, keyed by insight type
+INSIGHT_TYPE_ICONS = {
+    INSIGHT_TYPE_AUTOMATION: "mdi:robot",
+    INSIGHT_TYPE_ENERGY: "mdi:flash",
+    INSIGHT_TYPE_COMFORT: "mdi:sofa",
+    INSIGHT_TYPE_CONVENIENCE: "mdi:gesture-tap",
+    INSIGHT_TYPE_SECURITY: "mdi:shield",
+}
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -70,6 +78,8 @@ class InsightSensor(SensorEntity):
     _attr_has_entity_name = True
     _attr_entity_category = EntityCategory.DIAGNOSTIC
     _attr_icon = "mdi:lightbulb-outline"
+    # Suggestions carry full automation YAML; keep them out of the recorder
+    _unrecorded_attributes = frozenset({"description", "suggestions"})
     
     def __init__(self, hass: HomeAssistant, insight_id: int, insight: dict) -> None:
         """Initialize the insight sensor."""
@@ -77,17 +87,7 @@ class InsightSensor(SensorEntity):
         self.insight_id = insight_id
         self.insight = insight
         
-        insight_type = insight.get("type", "")
-        if insight_type == INSIGHT_TYPE_AUTOMATION:
-            self._attr_icon = "mdi:robot"
-        elif insight_type == INSIGHT_TYPE_ENERGY:
-            self._attr_icon = "mdi:flash"
-        elif insight_type == INSIGHT_TYPE_COMFORT:
-            self._attr_icon = "mdi:sofa"
-        elif insight_type == INSIGHT_TYPE_CONVENIENCE:
-            self._attr_icon = "mdi:gesture-tap"
-        elif insight_type == INSIGHT_TYPE_SECURITY:
-            self._attr_icon = "mdi:shield"
+        self._attr_icon = INSIGHT_TYPE_ICONS.get(insight.get("type", ""), self._attr_icon)
         
         self._attr_unique_id = f"insight_{insight_id}"
         self._attr_name = f"Insight {insight_id}"